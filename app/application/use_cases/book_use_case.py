@@ -1,16 +1,18 @@
 from fastapi import HTTPException
 
 from app.domain.book import Book
+from app.domain.schemas import BookResponse
 
 
 class BookUseCase:
-    def __init__(self, repository):
+    def __init__(self, repository, search_cache=None):
         self._repository = repository
+        self._search_cache = search_cache
 
-    def add(self, book):
+    def add(self, book, before_commit=None):
         book = Book(**book.dict())
         try:
-            return self._repository.add(book)
+            return self._repository.add(book, before_commit=before_commit)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
@@ -25,7 +27,10 @@ class BookUseCase:
 
     def update(self, book_id: int, updates: dict):
         book = self.get_by_id(book_id)
-        return self._repository.update(book, updates)
+        try:
+            return self._repository.update(book, updates)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Book not found")
 
     def delete(self, book_id: int):
         book = self.get_by_id(book_id)
@@ -36,7 +41,15 @@ class BookUseCase:
         return {"message": "Book deleted successfully"}
 
     def search(self, query: str):
-        books = self._repository.search(query)
+        if self._search_cache is None or not query.strip():
+            books = self._repository.search(query)
+        else:
+            query = query.strip()
+            books = self._search_cache.get(query)
+            if books is None:
+                version = self._search_cache.version
+                books = [BookResponse.model_validate(book) for book in self._repository.search(query)]
+                self._search_cache.set(query, books, version)
         if not books:
             raise HTTPException(status_code=404, detail="No books found matching the query.")
         return books
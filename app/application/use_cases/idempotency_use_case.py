@@ -0,0 +1,75 @@
+import hashlib
+import json
+import time
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+
+class IdempotencyUseCase:
+    POLL_INTERVAL_SECONDS = 0.05
+
+    def __init__(self, repository, ttl_seconds: int = None, lease_seconds: int = None, wait_seconds: float = None):
+        self._repository = repository
+        self._ttl_seconds = settings.IDEMPOTENCY_KEY_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._lease_seconds = settings.IDEMPOTENCY_KEY_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        self._wait_seconds = settings.IDEMPOTENCY_KEY_WAIT_SECONDS if wait_seconds is None else wait_seconds
+
+    @staticmethod
+    def fingerprint(method: str, path: str, payload) -> str:
+        body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{method} {path} {body}".encode()).hexdigest()
+
+    def execute(self, key: str, request_hash: str, operation):
+        """
+            Run ``operation`` at most once per idempotency key.
+
+            Returns a ``(status_code, body, replayed)`` tuple. The first request with a
+            given key runs the operation and stores its response; later requests with
+            the same key replay the stored response without calling ``operation``.
+            A duplicate that arrives while the first request is still running waits
+            for its response, and only gets a 409 if none is stored within
+            ``wait_seconds``.
+
+            ``operation`` is called with a ``stage(response)`` callback. Calling it
+            inside the operation's write transaction stores the response atomically
+            with the write, so a crash after the commit cannot make a retry redo it.
+            The response is stored again after ``operation`` returns, which covers
+            operations that do not stage it.
+        """
+        deadline = time.monotonic() + self._wait_seconds
+        while True:
+            existing = self._repository.claim(key, request_hash, self._ttl_seconds, self._lease_seconds)
+            if existing is None:
+                break
+            if existing.request_hash != request_hash:
+                raise HTTPException(
+                    status_code=422,
+                    detail="Idempotency-Key was already used with a different request.",
+                )
+            if existing.status_code is not None:
+                return existing.status_code, json.loads(existing.response_body), True
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=409,
+                    detail="A request with this Idempotency-Key is already in progress.",
+                )
+            time.sleep(self.POLL_INTERVAL_SECONDS)
+
+        def stage(response) -> None:
+            self._repository.stage(key, 200, json.dumps(jsonable_encoder(response)))
+
+        try:
+            status_code, body = 200, jsonable_encoder(operation(stage))
+        except HTTPException as e:
+            if e.status_code >= 500:
+                self._repository.release(key)
+                raise
+            status_code, body = e.status_code, {"detail": e.detail}
+        except Exception:
+            self._repository.release(key)
+            raise
+        self._repository.complete(key, status_code, json.dumps(body))
+        return status_code, body, False
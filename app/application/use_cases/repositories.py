@@ -1,12 +1,15 @@
 from abc import ABCMeta, abstractmethod
-from typing import List
+from datetime import datetime
+from typing import Callable, List, Optional
 
 from app.domain.book import Book
+from app.domain.idempotency_key import IdempotencyKey
+from app.domain.outbox_event import OutboxEvent
 
 
 class BookRepository(metaclass=ABCMeta):
     @abstractmethod
-    def add(self, book: Book) -> Book:
+    def add(self, book: Book, before_commit: Optional[Callable[[Book], None]] = None) -> Book:
         pass
 
     @abstractmethod
@@ -33,3 +36,46 @@ class BookRepository(metaclass=ABCMeta):
     def get_all(self) -> List[Book]:
         pass
 
+
+class IdempotencyRepository(metaclass=ABCMeta):
+    @abstractmethod
+    def claim(self, key: str, request_hash: str, ttl_seconds: int, lease_seconds: int) -> Optional[IdempotencyKey]:
+        pass
+
+    @abstractmethod
+    def stage(self, key: str, status_code: int, response_body: str) -> None:
+        pass
+
+    @abstractmethod
+    def complete(self, key: str, status_code: int, response_body: str) -> None:
+        pass
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def purge_expired(self, older_than: datetime) -> int:
+        pass
+
+
+class OutboxRepository(metaclass=ABCMeta):
+    @abstractmethod
+    def fetch_pending(self, limit: int, max_attempts: int) -> List[OutboxEvent]:
+        pass
+
+    @abstractmethod
+    def mark_processed(self, event: OutboxEvent) -> None:
+        pass
+
+    @abstractmethod
+    def mark_failed(self, event: OutboxEvent, error: str, retry_at: datetime) -> None:
+        pass
+
+    @abstractmethod
+    def purge_processed(self, older_than: datetime) -> int:
+        pass
+
+    @abstractmethod
+    def get_metrics(self, max_attempts: int) -> dict:
+        pass
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.infrastructure.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+    locked_at = Column(DateTime, nullable=True)
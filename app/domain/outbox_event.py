@@ -0,0 +1,16 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.infrastructure.database import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+    available_at = Column(DateTime, nullable=False, index=True)
+    processed_at = Column(DateTime, nullable=True, index=True)
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, Query, Path
+from fastapi import APIRouter, Depends, Header, Query, Path, Request
 from fastapi.params import Body
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.application.use_cases.book_use_case import BookUseCase
+from app.application.use_cases.idempotency_use_case import IdempotencyUseCase
 from app.domain.book import Book
 from app.domain.schemas import BookCreate, BookResponse
+from app.infrastructure.cache.search_cache import search_cache
 from app.infrastructure.database import get_db
 from app.infrastructure.repositories.pg_repositories.pg_book_repository import PGBookRepository
+from app.infrastructure.repositories.pg_repositories.pg_idempotency_repository import PGIdempotencyRepository
 
 book_router = APIRouter()
 
@@ -32,9 +36,21 @@ book_router = APIRouter()
             },
         },
         400: {"description": "Validation error."},
+        409: {"description": "A request with the same Idempotency-Key is still in progress."},
+        422: {"description": "The Idempotency-Key was already used with a different request."},
     },
 )
-def add_book(book: BookCreate, db: Session = Depends(get_db)):
+def add_book(
+        book: BookCreate,
+        request: Request,
+        idempotency_key: str = Header(
+            None,
+            alias="Idempotency-Key",
+            max_length=255,
+            description="Optional client-generated key. Retries with the same key replay the first response.",
+        ),
+        db: Session = Depends(get_db)
+):
     """
         Add a new book to the library.
 
@@ -42,9 +58,22 @@ def add_book(book: BookCreate, db: Session = Depends(get_db)):
         - **author**: The name of the author.
         - **year**: The year the book was published.
         - **isbn**: The ISBN of the book.
+        - **Idempotency-Key**: (Optional header) Retries with the same key return the stored response.
     """
     book_use_case = BookUseCase(repository=PGBookRepository(db=db))
-    return book_use_case.add(book)
+    if not idempotency_key:
+        return book_use_case.add(book)
+
+    idempotency_use_case = IdempotencyUseCase(repository=PGIdempotencyRepository(db=db))
+    status_code, body, replayed = idempotency_use_case.execute(
+        key=idempotency_key,
+        request_hash=IdempotencyUseCase.fingerprint(request.method, request.url.path, book),
+        operation=lambda stage: BookResponse.model_validate(
+            book_use_case.add(book, before_commit=lambda added: stage(BookResponse.model_validate(added)))
+        ),
+    )
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(status_code=status_code, content=body, headers=headers)
 
 
 @book_router.get(
@@ -151,7 +180,7 @@ def search_books(
 
         - If no books match the query, a 404 error is returned.
     """
-    book_use_case = BookUseCase(repository=PGBookRepository(db=db))
+    book_use_case = BookUseCase(repository=PGBookRepository(db=db), search_cache=search_cache)
     return book_use_case.search(query=query)
 
 
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.database import get_db
+from app.infrastructure.repositories.pg_repositories.pg_outbox_repository import PGOutboxRepository
+
+outbox_router = APIRouter()
+
+
+@outbox_router.get(
+    "/outbox/metrics/",
+    summary="Background task metrics",
+    description="Depth and lag of the outbox and the in-process task queue.",
+    tags=["Tasks"],
+    responses={
+        200: {
+            "description": "Current outbox and task queue metrics.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "outbox_depth": 3,
+                        "outbox_lag_seconds": 1.25,
+                        "outbox_failed": 0,
+                        "queue_depth": 0,
+                        "queue_running": 1,
+                    }
+                }
+            },
+        },
+    },
+)
+def get_outbox_metrics(request: Request, db: Session = Depends(get_db)):
+    """
+        Get background task metrics.
+
+        - **outbox_depth**: Events waiting to be processed.
+        - **outbox_lag_seconds**: Age of the oldest pending event.
+        - **outbox_failed**: Events that exhausted their retries.
+        - **queue_depth** / **queue_running**: Tasks queued and running in this process.
+    """
+    metrics = PGOutboxRepository(db=db).get_metrics(settings.OUTBOX_MAX_ATTEMPTS)
+    worker = getattr(request.app.state, "outbox_worker", None)
+    metrics["queue_depth"] = worker.task_queue.depth if worker else 0
+    metrics["queue_running"] = worker.task_queue.running if worker else 0
+    return metrics
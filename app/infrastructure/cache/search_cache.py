@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class CatalogVersion:
+    """
+        Write-version of the book catalog in this process.
+
+        Repositories bump it after every committed write; cached reads tagged with an
+        older version are treated as misses. Writes made by other processes do not
+        bump it, which is why cache entries also expire after a short TTL.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class SearchCache:
+    """
+        Bounded LRU cache of search results keyed on the normalized query.
+
+        Empty results are cached as well, so repeated zero-hit queries skip the scan.
+        Results longer than ``max_results`` are not cached, so broad queries cannot
+        fill the cache with copies of the catalog. Invalidation by write-version is
+        exact only within one process; with several workers or replicas, a write in
+        another process is picked up once the entry's ``ttl_seconds`` runs out.
+    """
+
+    def __init__(self, version: CatalogVersion, maxsize: int, max_results: int, ttl_seconds: float,
+                 clock=time.monotonic):
+        self._version = version
+        self._maxsize = maxsize
+        self._max_results = max_results
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        # Lower-casing matches the case folding ILIKE applies to the query.
+        return query.strip().lower()
+
+    @property
+    def version(self) -> int:
+        return self._version.value
+
+    def get(self, query: str):
+        key = self.normalize(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            version, expires_at, results = entry
+            if version != self._version.value or expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def set(self, query: str, results, version: int) -> None:
+        """
+            Store ``results`` computed against the catalog at ``version``.
+
+            ``version`` must be read before running the query, so results that raced
+            with a write are tagged with the old version and never served.
+        """
+        if self._maxsize <= 0 or len(results) > self._max_results:
+            return
+        key = self.normalize(query)
+        with self._lock:
+            self._entries[key] = (version, self._clock() + self._ttl_seconds, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+catalog_version = CatalogVersion()
+search_cache = SearchCache(
+    version=catalog_version,
+    maxsize=settings.SEARCH_CACHE_MAX_SIZE,
+    max_results=settings.SEARCH_CACHE_MAX_RESULTS,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+)
@@ -1,21 +1,49 @@
-from typing import List
+import json
+from typing import Callable, List, Optional
 
 from sqlalchemy import or_, cast, String
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.application.use_cases.repositories import BookRepository
+from app.core.utils import utcnow
 from app.domain.book import Book
+from app.domain.outbox_event import OutboxEvent
+from app.infrastructure.cache.search_cache import catalog_version
 
 
 class PGBookRepository(BookRepository):
     def __init__(self, db):
         self._db = db
 
-    def add(self, book: Book) -> Book:
+    def _record_event(self, event_type: str, book: Book, **extra) -> None:
+        # Written in the same transaction as the book change; drained by the outbox worker.
+        now = utcnow()
+        payload = {"id": book.id, "isbn": book.isbn, **extra}
+        self._db.add(OutboxEvent(
+            event_type=event_type,
+            payload=json.dumps(payload),
+            attempts=0,
+            created_at=now,
+            available_at=now,
+        ))
+
+    def add(self, book: Book, before_commit: Optional[Callable[[Book], None]] = None) -> Book:
         existing_book = self._db.query(Book).filter(Book.isbn == book.isbn).first()
         if existing_book:
             raise ValueError(f"A book with ISBN {book.isbn} already exists.")
-        self._db.add(book)
-        self._db.commit()
+        try:
+            self._db.add(book)
+            self._db.flush()
+            self._record_event("book.created", book)
+            if before_commit:
+                before_commit(book)
+            self._db.commit()
+        except IntegrityError:
+            # A concurrent request inserted the same ISBN after our duplicate check.
+            self._db.rollback()
+            raise ValueError(f"A book with ISBN {book.isbn} already exists.")
+        catalog_version.bump()
         self._db.refresh(book)
         return book
 
@@ -45,15 +73,30 @@ class PGBookRepository(BookRepository):
         if book:
             for key, value in updates.items():
                 setattr(book, key, value)
-            self._db.commit()
-            self._db.refresh(book)
+            self._record_event("book.updated", book, fields=sorted(updates))
+            snapshot = {column.key: getattr(book, column.key) for column in Book.__table__.columns}
+            try:
+                self._db.commit()
+            except StaleDataError as e:
+                # The book was deleted by a concurrent request.
+                self._db.rollback()
+                raise ValueError(f"Error updating book: {e}")
+            catalog_version.bump()
+            refreshed = self._db.query(Book).filter(Book.id == snapshot["id"]).first()
+            # The update is committed even if a concurrent delete won the race to reload it.
+            return refreshed if refreshed is not None else Book(**snapshot)
         return book
 
     def delete(self, book: Book) -> Book:
         try:
-            self._db.delete(book)
+            self._record_event("book.deleted", book)
+            deleted = self._db.query(Book).filter(Book.id == book.id).delete(synchronize_session="evaluate")
+            if not deleted:
+                raise ValueError("Book was already deleted.")
             self._db.commit()
+            catalog_version.bump()
         except Exception as e:
+            self._db.rollback()
             raise ValueError(f"Error deleting book: {e}")
 
     def get_all(self) -> List[Book]:
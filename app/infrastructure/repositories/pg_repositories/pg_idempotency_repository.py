@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.application.use_cases.repositories import IdempotencyRepository
+from app.core.utils import utcnow
+from app.domain.idempotency_key import IdempotencyKey
+
+
+class PGIdempotencyRepository(IdempotencyRepository):
+    def __init__(self, db):
+        self._db = db
+
+    def _insert(self):
+        # SQLite is only used by the test suite; both dialects support ON CONFLICT DO NOTHING.
+        if self._db.get_bind().dialect.name == "sqlite":
+            return sqlite_insert(IdempotencyKey)
+        return postgresql_insert(IdempotencyKey)
+
+    def claim(self, key: str, request_hash: str, ttl_seconds: int, lease_seconds: int) -> Optional[IdempotencyKey]:
+        """
+            Try to reserve the key for the current request.
+
+            Returns None when the key was reserved (the caller must do the work),
+            otherwise a detached copy of the record of the request that owns the key.
+            An unfinished key whose lease is older than ``lease_seconds`` is taken over,
+            so a crashed owner does not block retries until the key expires. The
+            transaction is always ended before returning, so callers that wait on the
+            key do not hold a connection.
+        """
+        now = utcnow()
+        inserted = self._db.execute(
+            self._insert()
+            .values(key=key, request_hash=request_hash, created_at=now, locked_at=now)
+            .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+        ).rowcount
+        if inserted:
+            self._db.commit()
+            return None
+
+        existing = self._db.query(IdempotencyKey).filter(IdempotencyKey.key == key).first()
+        if existing is None:
+            # The owner released the key in the meantime.
+            self._db.rollback()
+            return self.claim(key, request_hash, ttl_seconds, lease_seconds)
+        if existing.created_at < now - timedelta(seconds=ttl_seconds):
+            self._db.query(IdempotencyKey).filter(
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at == existing.created_at,
+            ).delete(synchronize_session=False)
+            self._db.commit()
+            return self.claim(key, request_hash, ttl_seconds, lease_seconds)
+        if (
+                existing.status_code is None
+                and existing.request_hash == request_hash
+                and existing.locked_at < now - timedelta(seconds=lease_seconds)
+        ):
+            taken_over = self._db.query(IdempotencyKey).filter(
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.locked_at == existing.locked_at,
+            ).update({"locked_at": now}, synchronize_session=False)
+            self._db.commit()
+            if taken_over:
+                return None
+            return self.claim(key, request_hash, ttl_seconds, lease_seconds)
+
+        self._db.expunge(existing)
+        self._db.rollback()
+        return existing
+
+    def stage(self, key: str, status_code: int, response_body: str) -> None:
+        self._db.query(IdempotencyKey).filter(IdempotencyKey.key == key).update(
+            {"status_code": status_code, "response_body": response_body, "locked_at": None},
+            synchronize_session=False,
+        )
+
+    def complete(self, key: str, status_code: int, response_body: str) -> None:
+        self.stage(key, status_code, response_body)
+        self._db.commit()
+
+    def release(self, key: str) -> None:
+        self._db.rollback()
+        # A response staged with a committed write must survive errors raised afterwards.
+        self._db.query(IdempotencyKey).filter(
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None),
+        ).delete(synchronize_session=False)
+        self._db.commit()
+
+    def purge_expired(self, older_than: datetime) -> int:
+        return self._db.query(IdempotencyKey).filter(
+            IdempotencyKey.created_at < older_than
+        ).delete(synchronize_session=False)
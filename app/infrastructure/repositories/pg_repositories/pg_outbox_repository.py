@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import func
+
+from app.application.use_cases.repositories import OutboxRepository
+from app.core.utils import utcnow
+from app.domain.outbox_event import OutboxEvent
+
+
+class PGOutboxRepository(OutboxRepository):
+    def __init__(self, db):
+        self._db = db
+
+    def _pending(self, max_attempts: int):
+        return self._db.query(OutboxEvent).filter(
+            OutboxEvent.processed_at.is_(None),
+            OutboxEvent.attempts < max_attempts,
+        )
+
+    def fetch_pending(self, limit: int, max_attempts: int) -> List[OutboxEvent]:
+        return (
+            self._pending(max_attempts)
+            .filter(OutboxEvent.available_at <= utcnow())
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def mark_processed(self, event: OutboxEvent) -> None:
+        event.attempts += 1
+        event.processed_at = utcnow()
+        event.last_error = None
+
+    def mark_failed(self, event: OutboxEvent, error: str, retry_at: datetime) -> None:
+        event.attempts += 1
+        event.available_at = retry_at
+        event.last_error = error
+
+    def purge_processed(self, older_than: datetime) -> int:
+        return self._db.query(OutboxEvent).filter(
+            OutboxEvent.processed_at < older_than
+        ).delete(synchronize_session=False)
+
+    def get_metrics(self, max_attempts: int) -> dict:
+        depth, oldest = self._pending(max_attempts).with_entities(
+            func.count(OutboxEvent.id), func.min(OutboxEvent.created_at)
+        ).one()
+        failed = self._db.query(func.count(OutboxEvent.id)).filter(
+            OutboxEvent.processed_at.is_(None),
+            OutboxEvent.attempts >= max_attempts,
+        ).scalar()
+        lag = (utcnow() - oldest).total_seconds() if oldest else 0.0
+        return {"outbox_depth": depth, "outbox_lag_seconds": lag, "outbox_failed": failed}
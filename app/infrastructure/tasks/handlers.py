@@ -0,0 +1,17 @@
+import json
+import logging
+
+from app.infrastructure.tasks.outbox_worker import register_handler
+
+change_feed_logger = logging.getLogger("app.change_feed")
+
+
+def _publish_change(event_type: str):
+    def handler(payload: dict) -> None:
+        change_feed_logger.info("%s %s", event_type, json.dumps(payload, sort_keys=True))
+
+    return handler
+
+
+for _event_type in ("book.created", "book.updated", "book.deleted"):
+    register_handler(_event_type, _publish_change(_event_type))
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Callable
+
+from app.core.config import settings
+from app.core.utils import utcnow
+from app.infrastructure.repositories.pg_repositories.pg_idempotency_repository import PGIdempotencyRepository
+from app.infrastructure.repositories.pg_repositories.pg_outbox_repository import PGOutboxRepository
+from app.infrastructure.tasks.task_queue import TaskQueue
+
+logger = logging.getLogger(__name__)
+
+_handlers = defaultdict(list)
+
+
+def register_handler(event_type: str, handler: Callable[[dict], None]) -> Callable[[dict], None]:
+    """
+        Register a post-commit side effect for ``event_type``.
+
+        Handlers receive the decoded event payload and may be sync or async.
+    """
+    _handlers[event_type].append(handler)
+    return handler
+
+
+class OutboxWorker:
+    def __init__(
+            self,
+            session_factory,
+            task_queue: TaskQueue,
+            batch_size: int = None,
+            poll_interval: float = None,
+            max_attempts: int = None,
+            retry_backoff: float = None,
+            retention: float = None,
+            purge_interval: float = None,
+            handlers: dict = None,
+    ):
+        self._session_factory = session_factory
+        self._task_queue = task_queue
+        self._batch_size = settings.OUTBOX_BATCH_SIZE if batch_size is None else batch_size
+        self._poll_interval = settings.OUTBOX_POLL_INTERVAL_SECONDS if poll_interval is None else poll_interval
+        self._max_attempts = settings.OUTBOX_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self._retry_backoff = settings.OUTBOX_RETRY_BACKOFF_SECONDS if retry_backoff is None else retry_backoff
+        self._retention = settings.OUTBOX_RETENTION_SECONDS if retention is None else retention
+        self._purge_interval = settings.OUTBOX_PURGE_INTERVAL_SECONDS if purge_interval is None else purge_interval
+        self._handlers = _handlers if handlers is None else handlers
+        self._task = None
+
+    @property
+    def task_queue(self) -> TaskQueue:
+        return self._task_queue
+
+    def start(self) -> None:
+        self._task_queue.start()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._task_queue.stop()
+
+    async def _run(self) -> None:
+        next_purge = time.monotonic()
+        while True:
+            try:
+                processed = await self.drain_once()
+            except Exception:
+                logger.exception("Outbox drain failed")
+                processed = 0
+            if time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + self._purge_interval
+                try:
+                    await self.purge_once()
+                except Exception:
+                    logger.exception("Outbox purge failed")
+            if processed < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    async def drain_once(self) -> int:
+        """
+            Run the handlers for one batch of pending outbox events.
+
+            Each handler is a separate task on the queue. An event whose handlers
+            fail is rescheduled with exponential backoff until ``max_attempts`` is
+            reached. Returns the number of events fetched.
+        """
+        db = self._session_factory()
+        try:
+            repository = PGOutboxRepository(db=db)
+            events = await asyncio.to_thread(repository.fetch_pending, self._batch_size, self._max_attempts)
+            submitted = []
+            for event in events:
+                payload = json.loads(event.payload)
+                futures = [
+                    await self._task_queue.submit(handler, payload)
+                    for handler in self._handlers.get(event.event_type, [])
+                ]
+                submitted.append((event, futures))
+            for event, futures in submitted:
+                results = await asyncio.gather(*futures, return_exceptions=True)
+                errors = [result for result in results if isinstance(result, Exception)]
+                if errors:
+                    retry_at = utcnow() + timedelta(seconds=self._retry_backoff * 2 ** event.attempts)
+                    repository.mark_failed(event, repr(errors[0]), retry_at)
+                    logger.warning("Outbox event %s (%s) failed: %r", event.id, event.event_type, errors[0])
+                else:
+                    repository.mark_processed(event)
+            await asyncio.to_thread(db.commit)
+            return len(events)
+        finally:
+            db.close()
+
+    async def purge_once(self) -> int:
+        """
+            Delete events processed more than ``retention`` seconds ago.
+
+            Events that exhausted their retries are kept for inspection. Expired
+            idempotency keys are evicted in the same pass.
+        """
+        db = self._session_factory()
+        try:
+            now = utcnow()
+            purged = await asyncio.to_thread(
+                PGOutboxRepository(db=db).purge_processed, now - timedelta(seconds=self._retention)
+            )
+            await asyncio.to_thread(
+                PGIdempotencyRepository(db=db).purge_expired,
+                now - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+            )
+            await asyncio.to_thread(db.commit)
+            return purged
+        finally:
+            db.close()
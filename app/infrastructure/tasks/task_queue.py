@@ -0,0 +1,65 @@
+import asyncio
+import inspect
+from typing import Awaitable, Callable
+
+
+class TaskQueue:
+    """
+        In-process async task queue.
+
+        At most ``concurrency`` tasks run at once, and ``submit`` waits while
+        ``maxsize`` tasks are already queued, pushing backpressure onto the producer.
+    """
+
+    def __init__(self, concurrency: int, maxsize: int):
+        self._concurrency = concurrency
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._workers = []
+        self._running = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self._concurrency)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, func: Callable, *args) -> Awaitable:
+        """
+            Queue ``func(*args)`` and return a future with its result.
+
+            Coroutine functions are awaited; plain functions run in a worker thread.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((func, args, future))
+        return future
+
+    async def _work(self) -> None:
+        while True:
+            func, args, future = await self._queue.get()
+            self._running += 1
+            try:
+                if inspect.iscoroutinefunction(func):
+                    result = await func(*args)
+                else:
+                    result = await asyncio.to_thread(func, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._running -= 1
+                self._queue.task_done()
@@ -1,7 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.core.config import settings
 from app.infrastructure.api.book_router import book_router
-from app.infrastructure.database import engine, Base
+from app.infrastructure.api.outbox_router import outbox_router
+from app.infrastructure.database import engine, Base, SessionLocal
+from app.infrastructure.tasks import handlers  # noqa: F401  (registers outbox handlers)
+from app.infrastructure.tasks.outbox_worker import OutboxWorker
+from app.infrastructure.tasks.task_queue import TaskQueue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not settings.OUTBOX_WORKER_ENABLED:
+        yield
+        return
+    app.state.outbox_worker = OutboxWorker(
+        session_factory=SessionLocal,
+        task_queue=TaskQueue(
+            concurrency=settings.TASK_QUEUE_CONCURRENCY,
+            maxsize=settings.TASK_QUEUE_MAX_SIZE,
+        ),
+    )
+    app.state.outbox_worker.start()
+    try:
+        yield
+    finally:
+        await app.state.outbox_worker.stop()
+        app.state.outbox_worker = None
+
 
 app = FastAPI(
     title="Library API",
@@ -15,8 +43,10 @@ app = FastAPI(
         "name": "MIT License",
         "url": "https://opensource.org/licenses/MIT",
     },
+    lifespan=lifespan,
 )
 
 Base.metadata.create_all(bind=engine)
 
 app.include_router(book_router, prefix="/api/v1", tags=["Books"])
+app.include_router(outbox_router, prefix="/api/v1", tags=["Tasks"])
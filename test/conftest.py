@@ -1,32 +1,118 @@
+import os
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from app.infrastructure.database import Base, get_db
-from app.main import app
+from app.core.config import settings
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Point TEST_DATABASE_URL at a dedicated local Postgres database (e.g. `library_test`
+# on the docker-compose `db` service) to run the suite against the production dialect.
+# The suite drops and empties every table, so it refuses to touch the app's database.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite:///./test.db")
+if TEST_DATABASE_URL == settings.DATABASE_URL:
+    raise pytest.UsageError("TEST_DATABASE_URL must not be the application's DATABASE_URL.")
+if "test" not in (make_url(TEST_DATABASE_URL).database or ""):
+    raise pytest.UsageError("TEST_DATABASE_URL must name a test database (e.g. library_test).")
+settings.DATABASE_URL = TEST_DATABASE_URL
 
-Base.metadata.create_all(bind=engine)
+from app.infrastructure.cache.search_cache import search_cache  # noqa: E402
+from app.infrastructure.database import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
 
+IS_SQLITE = TEST_DATABASE_URL.startswith("sqlite")
+STRESS_THREADS = int(os.getenv("STRESS_THREADS", "16"))
 
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
+def _create_engine():
+    if not IS_SQLITE:
+        return create_engine(TEST_DATABASE_URL)
 
-app.dependency_overrides[get_db] = override_get_db
+    # A single connection is shared by the TestClient threadpool, and pysqlite's own
+    # transaction handling must be disabled for SAVEPOINTs to work.
+    sqlite_engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
 
+    @event.listens_for(sqlite_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
 
-@pytest.fixture(scope="function")
-def client():
+    @event.listens_for(sqlite_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return sqlite_engine
+
+
+engine = _create_engine()
+settings.OUTBOX_WORKER_ENABLED = False
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def session_factory():
+    """
+        Sessions bound to one connection whose outer transaction is rolled back
+        after the test. Commits made by the app only release a SAVEPOINT.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        yield sessionmaker(
+            bind=connection,
+            autocommit=False,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="function")
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    search_cache.clear()
     with TestClient(app) as c:
         yield c
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(scope="function")
+def committing_session_factory():
+    """
+        Sessions that really commit, each on its own connection, for concurrency tests.
+
+        Tables are emptied afterwards. SQLite connections are not shared between
+        threads here, so misuse of a session across threads surfaces as an error.
+    """
+    if IS_SQLITE:
+        stress_engine = create_engine(TEST_DATABASE_URL, poolclass=NullPool, connect_args={"timeout": 30})
+    else:
+        # One connection per stress thread plus one for setup and assertions.
+        stress_engine = create_engine(TEST_DATABASE_URL, pool_size=STRESS_THREADS + 1, max_overflow=0)
+    search_cache.clear()
+    try:
+        yield sessionmaker(bind=stress_engine, autocommit=False, autoflush=False)
+    finally:
+        with stress_engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
+        stress_engine.dispose()
+        search_cache.clear()
@@ -0,0 +1,147 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.application.use_cases.book_use_case import BookUseCase
+from app.application.use_cases.idempotency_use_case import IdempotencyUseCase
+from app.domain.book import Book
+from app.domain.outbox_event import OutboxEvent
+from app.domain.schemas import BookCreate
+from app.infrastructure.repositories.pg_repositories.pg_book_repository import PGBookRepository
+from app.infrastructure.repositories.pg_repositories.pg_idempotency_repository import PGIdempotencyRepository
+from test.conftest import STRESS_THREADS
+
+book_data = {
+    "title": "The Great Gatsby",
+    "author": "F. Scott Fitzgerald",
+    "year": 1925,
+    "isbn": "9780743273565"
+}
+
+
+def _book_use_case(db):
+    return BookUseCase(repository=PGBookRepository(db=db))
+
+
+def _run_concurrently(session_factory, operation, count=STRESS_THREADS):
+    """
+        Run ``operation(db, index)`` from ``count`` threads released together.
+
+        Each call gets its own session. Returns the results (or raised exceptions)
+        and prints latency figures so contention can be compared across runs.
+    """
+    barrier = threading.Barrier(count)
+
+    def call(index):
+        db = session_factory()
+        try:
+            barrier.wait()
+            started = time.perf_counter()
+            try:
+                result = operation(db, index)
+            except Exception as e:
+                result = e
+            return result, time.perf_counter() - started
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        outcomes = list(executor.map(call, range(count)))
+
+    latencies = sorted(latency for _, latency in outcomes)
+    print(
+        f"\n{operation.__name__}: {count} threads, "
+        f"median {statistics.median(latencies) * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms"
+    )
+    return [result for result, _ in outcomes]
+
+
+def _status_code(result):
+    if isinstance(result, HTTPException):
+        return result.status_code
+    return 500 if isinstance(result, Exception) else 200
+
+
+def _status_codes(results):
+    return sorted(_status_code(result) for result in results)
+
+
+def test_concurrent_add_same_isbn(committing_session_factory):
+    def add_same_isbn(db, index):
+        return _book_use_case(db).add(BookCreate(**{**book_data, "title": f"Copy {index}"}))
+
+    results = _run_concurrently(committing_session_factory, add_same_isbn)
+
+    assert _status_codes(results) == [200] + [400] * (STRESS_THREADS - 1)
+    db = committing_session_factory()
+    try:
+        assert db.query(Book).filter(Book.isbn == book_data["isbn"]).count() == 1
+    finally:
+        db.close()
+
+
+def test_concurrent_updates_of_different_fields(committing_session_factory):
+    db = committing_session_factory()
+    book_id = _book_use_case(db).add(BookCreate(**book_data)).id
+    db.close()
+
+    def update_field(db, index):
+        field = "title" if index % 2 else "author"
+        return _book_use_case(db).update(book_id, {field: f"{field} {index}"})
+
+    results = _run_concurrently(committing_session_factory, update_field)
+
+    assert _status_codes(results) == [200] * STRESS_THREADS
+    db = committing_session_factory()
+    try:
+        book = db.query(Book).filter(Book.id == book_id).one()
+        assert book.title.startswith("title ")
+        assert book.author.startswith("author ")
+    finally:
+        db.close()
+
+
+def test_concurrent_update_and_delete(committing_session_factory):
+    db = committing_session_factory()
+    book_id = _book_use_case(db).add(BookCreate(**book_data)).id
+    db.close()
+
+    def update_or_delete(db, index):
+        use_case = _book_use_case(db)
+        if index % 2:
+            return use_case.delete(book_id)
+        return use_case.update(book_id, {"year": 1900 + index})
+
+    results = _run_concurrently(committing_session_factory, update_or_delete)
+
+    deletes = [result for index, result in enumerate(results) if index % 2]
+    assert _status_codes(deletes).count(200) == 1
+    assert set(_status_codes(results)) <= {200, 404}
+    db = committing_session_factory()
+    try:
+        assert db.query(Book).filter(Book.id == book_id).first() is None
+        assert db.query(OutboxEvent).filter(OutboxEvent.event_type == "book.deleted").count() == 1
+    finally:
+        db.close()
+
+
+def test_concurrent_add_same_idempotency_key(committing_session_factory):
+    calls = []
+
+    def add_with_same_key(db, index):
+        def operation(stage):
+            calls.append(index)
+            book = _book_use_case(db).add(BookCreate(**book_data), before_commit=lambda added: stage(added.id))
+            return book.id
+
+        repository = PGIdempotencyRepository(db=db)
+        return IdempotencyUseCase(repository=repository).execute("create-gatsby", "hash", operation)
+
+    results = _run_concurrently(committing_session_factory, add_with_same_key)
+
+    assert len(calls) == 1
+    assert {(status_code, body) for status_code, body, _ in results} == {(200, results[0][1])}
+    assert sorted(replayed for _, _, replayed in results) == [False] + [True] * (STRESS_THREADS - 1)
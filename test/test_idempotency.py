@@ -0,0 +1,130 @@
+import pytest
+from fastapi import HTTPException
+
+from app.application.use_cases.book_use_case import BookUseCase
+from app.application.use_cases.idempotency_use_case import IdempotencyUseCase
+from app.domain.schemas import BookCreate
+from app.infrastructure.repositories.pg_repositories.pg_book_repository import PGBookRepository
+from app.infrastructure.repositories.pg_repositories.pg_idempotency_repository import PGIdempotencyRepository
+
+book_data = {
+    "title": "The Great Gatsby",
+    "author": "F. Scott Fitzgerald",
+    "year": 1925,
+    "isbn": "9780743273565"
+}
+
+
+def test_add_book_with_idempotency_key_replays_response(client):
+    headers = {"Idempotency-Key": "create-gatsby"}
+    first = client.post("/api/v1/books/", json=book_data, headers=headers)
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = client.post("/api/v1/books/", json=book_data, headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    response = client.get("/api/v1/books/")
+    assert len(response.json()) == 1
+
+
+def test_add_book_with_reused_idempotency_key_and_different_body(client):
+    headers = {"Idempotency-Key": "create-gatsby"}
+    client.post("/api/v1/books/", json=book_data, headers=headers)
+
+    other_book = {**book_data, "isbn": "9780061120084"}
+    response = client.post("/api/v1/books/", json=other_book, headers=headers)
+    assert response.status_code == 422
+
+
+def test_add_book_with_idempotency_key_replays_errors(client):
+    client.post("/api/v1/books/", json=book_data)
+
+    headers = {"Idempotency-Key": "duplicate-gatsby"}
+    first = client.post("/api/v1/books/", json=book_data, headers=headers)
+    assert first.status_code == 400
+
+    client.delete(f"/api/v1/books/{client.get('/api/v1/books/').json()[0]['id']}/")
+    retry = client.post("/api/v1/books/", json=book_data, headers=headers)
+    assert retry.status_code == 400
+    assert retry.json() == first.json()
+
+
+def test_unfinished_idempotency_key_is_taken_over_after_lease(session_factory):
+    db = session_factory()
+    try:
+        repository = PGIdempotencyRepository(db=db)
+        assert repository.claim("crashed", "hash", ttl_seconds=60, lease_seconds=60) is None
+
+        in_progress = repository.claim("crashed", "hash", ttl_seconds=60, lease_seconds=60)
+        assert in_progress.status_code is None
+
+        assert repository.claim("crashed", "hash", ttl_seconds=60, lease_seconds=0) is None
+    finally:
+        db.close()
+
+
+def test_waiting_for_idempotency_key_releases_the_connection(session_factory):
+    db = session_factory()
+    try:
+        repository = PGIdempotencyRepository(db=db)
+        repository.claim("slow", "hash", ttl_seconds=60, lease_seconds=60)
+
+        in_progress = repository.claim("slow", "hash", ttl_seconds=60, lease_seconds=60)
+        assert in_progress.status_code is None
+        assert not db.in_transaction()
+    finally:
+        db.close()
+
+
+def test_expired_idempotency_key_is_replaced(session_factory):
+    db = session_factory()
+    try:
+        repository = PGIdempotencyRepository(db=db)
+        repository.claim("old", "hash", ttl_seconds=60, lease_seconds=60)
+        repository.complete("old", 200, "{}")
+
+        assert repository.claim("old", "other-hash", ttl_seconds=0, lease_seconds=60) is None
+    finally:
+        db.close()
+
+
+def test_in_progress_idempotency_key_conflicts_after_wait(session_factory):
+    db = session_factory()
+    try:
+        repository = PGIdempotencyRepository(db=db)
+        repository.claim("slow", "hash", ttl_seconds=60, lease_seconds=60)
+
+        use_case = IdempotencyUseCase(repository=repository, lease_seconds=60, wait_seconds=0)
+        with pytest.raises(HTTPException) as e:
+            use_case.execute("slow", "hash", operation=lambda stage: {})
+        assert e.value.status_code == 409
+    finally:
+        db.close()
+
+
+def test_staged_response_survives_failure_after_commit(client, session_factory):
+    db = session_factory()
+    try:
+        book_use_case = BookUseCase(repository=PGBookRepository(db=db))
+        use_case = IdempotencyUseCase(repository=PGIdempotencyRepository(db=db))
+
+        def operation(stage):
+            book_use_case.add(BookCreate(**book_data), before_commit=lambda added: stage({"id": added.id}))
+            raise RuntimeError("crashed after commit")
+
+        with pytest.raises(RuntimeError):
+            use_case.execute("create-gatsby", "hash", operation)
+
+        status_code, body, replayed = use_case.execute("create-gatsby", "hash", operation)
+        assert (status_code, replayed) == (200, True)
+        assert body["id"] == client.get("/api/v1/books/").json()[0]["id"]
+    finally:
+        db.close()
+
+
+def test_idempotency_key_longer_than_column_is_rejected(client):
+    response = client.post("/api/v1/books/", json=book_data, headers={"Idempotency-Key": "k" * 256})
+    assert response.status_code == 422
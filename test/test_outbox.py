@@ -0,0 +1,138 @@
+import asyncio
+import json
+import logging
+
+from app.domain.outbox_event import OutboxEvent
+from app.infrastructure.tasks.outbox_worker import OutboxWorker
+from app.infrastructure.tasks.task_queue import TaskQueue
+
+book_data = {
+    "title": "The Great Gatsby",
+    "author": "F. Scott Fitzgerald",
+    "year": 1925,
+    "isbn": "9780743273565"
+}
+
+
+def _drain(session_factory, handlers=None, max_attempts=3):
+    async def run():
+        task_queue = TaskQueue(concurrency=2, maxsize=4)
+        task_queue.start()
+        worker = OutboxWorker(
+            session_factory=session_factory,
+            task_queue=task_queue,
+            max_attempts=max_attempts,
+            retry_backoff=0,
+            handlers=handlers,
+        )
+        try:
+            return await worker.drain_once()
+        finally:
+            await task_queue.stop()
+
+    return asyncio.run(run())
+
+
+def _events(session_factory):
+    db = session_factory()
+    try:
+        return [(e.event_type, json.loads(e.payload), e.attempts, e.processed_at) for e in db.query(OutboxEvent)]
+    finally:
+        db.close()
+
+
+def test_writes_record_outbox_events(client, session_factory):
+    book_id = client.post("/api/v1/books/", json=book_data).json()["id"]
+    client.put(f"/api/v1/books/{book_id}/", json={"year": 1926})
+    client.delete(f"/api/v1/books/{book_id}/")
+
+    events = _events(session_factory)
+    assert [e[0] for e in events] == ["book.created", "book.updated", "book.deleted"]
+    assert events[0][1] == {"id": book_id, "isbn": book_data["isbn"]}
+    assert events[1][1]["fields"] == ["year"]
+
+
+def test_worker_runs_handlers_and_marks_events_processed(client, session_factory):
+    book_id = client.post("/api/v1/books/", json=book_data).json()["id"]
+    seen = []
+
+    assert _drain(session_factory, {"book.created": [seen.append]}) == 1
+    assert seen == [{"id": book_id, "isbn": book_data["isbn"]}]
+    assert _events(session_factory)[0][3] is not None
+    assert _drain(session_factory, {"book.created": [seen.append]}) == 0
+
+
+def test_worker_retries_failed_events(client, session_factory):
+    client.post("/api/v1/books/", json=book_data)
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    _drain(session_factory, {"book.created": [flaky]})
+    assert _events(session_factory)[0][2:] == (1, None)
+
+    _drain(session_factory, {"book.created": [flaky]})
+    event = _events(session_factory)[0]
+    assert event[2] == 2
+    assert event[3] is not None
+
+
+def test_outbox_metrics(client):
+    client.post("/api/v1/books/", json=book_data)
+
+    response = client.get("/api/v1/outbox/metrics/")
+    assert response.status_code == 200
+    metrics = response.json()
+    assert metrics["outbox_depth"] == 1
+    assert metrics["outbox_lag_seconds"] >= 0
+    assert metrics["queue_depth"] == 0
+
+
+def test_registered_handlers_publish_change_feed(client, session_factory, caplog):
+    book_id = client.post("/api/v1/books/", json=book_data).json()["id"]
+
+    with caplog.at_level(logging.INFO, logger="app.change_feed"):
+        assert _drain(session_factory) == 1
+    assert caplog.messages == [f'book.created {{"id": {book_id}, "isbn": "{book_data["isbn"]}"}}']
+
+
+def test_worker_purges_old_processed_events(client, session_factory):
+    client.post("/api/v1/books/", json=book_data)
+    client.post("/api/v1/books/", json={**book_data, "isbn": "9780061120084"})
+    _drain(session_factory, {})
+
+    async def purge(retention):
+        worker = OutboxWorker(session_factory=session_factory, task_queue=TaskQueue(1, 1), retention=retention)
+        return await worker.purge_once()
+
+    assert asyncio.run(purge(retention=60)) == 0
+    assert asyncio.run(purge(retention=0)) == 2
+    assert _events(session_factory) == []
+
+
+def test_worker_purges_on_its_own_interval(session_factory):
+    purges = []
+
+    async def run():
+        worker = OutboxWorker(
+            session_factory=session_factory,
+            task_queue=TaskQueue(1, 1),
+            poll_interval=0.01,
+            purge_interval=60,
+            handlers={},
+        )
+
+        async def purge_once():
+            purges.append(True)
+            return 0
+
+        worker.purge_once = purge_once
+        worker.start()
+        await asyncio.sleep(0.1)
+        await worker.stop()
+
+    asyncio.run(run())
+    assert len(purges) == 1
@@ -0,0 +1,89 @@
+from app.infrastructure.cache.search_cache import CatalogVersion, SearchCache
+
+book_data = {
+    "title": "The Great Gatsby",
+    "author": "F. Scott Fitzgerald",
+    "year": 1925,
+    "isbn": "9780743273565"
+}
+
+
+def test_search_cache_normalizes_query():
+    cache = SearchCache(version=CatalogVersion(), maxsize=2, max_results=10, ttl_seconds=60)
+    cache.set("  Gatsby ", ["cached"], cache.version)
+    assert cache.get("gatsby") == ["cached"]
+
+
+def test_search_cache_evicts_least_recently_used():
+    cache = SearchCache(version=CatalogVersion(), maxsize=2, max_results=10, ttl_seconds=60)
+    cache.set("a", ["a"], cache.version)
+    cache.set("b", ["b"], cache.version)
+    cache.get("a")
+    cache.set("c", ["c"], cache.version)
+    assert cache.get("b") is None
+    assert cache.get("a") == ["a"]
+
+
+def test_search_cache_skips_large_results():
+    cache = SearchCache(version=CatalogVersion(), maxsize=2, max_results=2, ttl_seconds=60)
+    cache.set("1", ["a", "b", "c"], cache.version)
+    assert cache.get("1") is None
+
+
+def test_search_cache_entries_expire():
+    now = [0.0]
+    cache = SearchCache(version=CatalogVersion(), maxsize=2, max_results=10, ttl_seconds=30, clock=lambda: now[0])
+    cache.set("gatsby", ["cached"], cache.version)
+    now[0] = 29.0
+    assert cache.get("gatsby") == ["cached"]
+    now[0] = 30.0
+    assert cache.get("gatsby") is None
+
+
+def test_search_cache_ignores_entries_from_older_versions():
+    version = CatalogVersion()
+    cache = SearchCache(version=version, maxsize=2, max_results=10, ttl_seconds=60)
+    cache.set("gatsby", [], cache.version)
+    version.bump()
+    assert cache.get("gatsby") is None
+
+
+def test_search_negative_result_invalidated_by_add(client):
+    response = client.get("/api/v1/books/search/", params={"query": "Gatsby"})
+    assert response.status_code == 404
+
+    client.post("/api/v1/books/", json=book_data)
+    response = client.get("/api/v1/books/search/", params={"query": " GATSBY "})
+    assert response.status_code == 200
+    assert response.json()[0]["title"] == book_data["title"]
+
+
+def test_search_result_invalidated_by_update_and_delete(client):
+    book_id = client.post("/api/v1/books/", json=book_data).json()["id"]
+    assert client.get("/api/v1/books/search/", params={"query": "Gatsby"}).status_code == 200
+
+    client.put(f"/api/v1/books/{book_id}/", json={"title": "Tender Is the Night"})
+    response = client.get("/api/v1/books/search/", params={"query": "Gatsby"})
+    assert response.status_code == 404
+
+    response = client.get("/api/v1/books/search/", params={"query": "tender"})
+    assert response.status_code == 200
+
+    client.delete(f"/api/v1/books/{book_id}/")
+    response = client.get("/api/v1/books/search/", params={"query": "tender"})
+    assert response.status_code == 404
+
+
+def test_search_passes_original_query_to_repository(client):
+    client.post("/api/v1/books/", json={**book_data, "title": "Die Straße"})
+
+    response = client.get("/api/v1/books/search/", params={"query": "Straße"})
+    assert response.status_code == 200
+    assert response.json()[0]["title"] == "Die Straße"
+
+
+def test_search_blank_query_is_not_rejected(client):
+    client.post("/api/v1/books/", json={**book_data, "title": "The Great  Gatsby"})
+
+    response = client.get("/api/v1/books/search/", params={"query": "  "})
+    assert response.status_code == 200